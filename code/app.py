@@ -1,6 +1,10 @@
 import base64
+import binascii
 import io
 import math
+import threading
+import uuid
+from collections import OrderedDict
 
 import numpy as np
 import pandas as pd
@@ -9,6 +13,48 @@ from dash import Dash, dcc, html, Input, Output, State
 from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 
+try:
+    from numba import njit
+    from numba import types as nbt
+    HAVE_NUMBA = True
+
+    # Eager float32/float64 signatures. Inputs are typed read-only so pandas'
+    # copy-on-write .values views match; writable arrays still convert to them.
+    def _arr(dtype, ndim=1, readonly=False):
+        return nbt.Array(dtype, ndim, "A", readonly=readonly)
+
+    _FLOATS = (nbt.float32, nbt.float64)
+    UNWRAP_SIGS = [nbt.void(_arr(f, readonly=True), _arr(f)) for f in _FLOATS]
+    EMA_SIGS = [nbt.void(_arr(f, readonly=True), nbt.float64, _arr(f)) for f in _FLOATS]
+    EMA_MULTI_SIGS = [
+        nbt.void(_arr(f, 2, readonly=True), _arr(f, readonly=True), _arr(f, 2))
+        for f in _FLOATS
+    ]
+except ImportError:  # numba is optional; fall back to plain Python loops
+    HAVE_NUMBA = False
+    UNWRAP_SIGS = EMA_SIGS = EMA_MULTI_SIGS = None
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda f: f
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; plain NumPy is used instead
+    ne = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; pandas' CSV reader is used instead
+    pacsv = None
+
+try:
+    from flask_caching import Cache
+except ImportError:  # Flask-Caching is optional; a small in-process LRU is used instead
+    Cache = None
+
 # ============================================================
 # USER SETTINGS
 # ============================================================ 
@@ -32,39 +78,115 @@ IMU_ACCEL_SMOOTH_ALPHA = 0.20   # accel smoothing
 # RPM calibration: from your data, ~128 pulses per revolution at ~1800 rpm idle
 PULSES_PER_REV = 128.0
 RPM_SMOOTH_ALPHA = 0.20
+
+# Plotting: long views are strided down to roughly this many points
+PLOT_DOWNSAMPLE_ABOVE = 10000
+PLOT_MAX_POINTS = 4000
+
+# Number of processed uploads kept server-side
+DF_CACHE_SIZE = 20
 # ============================================================
 
+# Start gate in radians, precomputed for the lap-detection distance
+_PHI0 = math.radians(START_LAT)
+_LMB0 = math.radians(START_LON)
+_COS_PHI0 = math.cos(_PHI0)
+
 
 # ------------------------------------------------------------
 # Angle helpers
 # ------------------------------------------------------------
+def as_float(x):
+    """View `x` as a float32/float64 array; any other dtype becomes float64."""
+    x = np.asarray(x)
+    if x.dtype != np.float32 and x.dtype != np.float64:
+        x = x.astype(np.float64)
+    return x
+
+
 def wrap180(a):
     return ((a + 180.0) % 360.0) - 180.0
 
 
+@njit(UNWRAP_SIGS, cache=True)
+def unwrap_deg_inplace(a, out):
+    """Unwrap `a` (deg) into `out`, same rule as np.unwrap with a 180° discont."""
+    if len(a) == 0:
+        return
+    out[0] = a[0]
+    correction = 0.0
+    for i in range(1, len(a)):
+        dd = a[i] - a[i - 1]
+        if abs(dd) >= 180.0:
+            ddmod = ((dd + 180.0) % 360.0) - 180.0
+            if ddmod == -180.0 and dd > 0:
+                ddmod = 180.0
+            correction += ddmod - dd
+        out[i] = a[i] + correction
+
+
 def unwrap_deg(angle_deg):
     """Unwrap degrees to make them continuous (remove 360° jumps)."""
-    a = np.unwrap(np.radians(angle_deg))
-    return np.degrees(a)
+    a = as_float(angle_deg)
+    if not HAVE_NUMBA:
+        # The interpreted loop is far slower than NumPy's vectorized unwrap
+        return np.degrees(np.unwrap(np.radians(a))).astype(a.dtype, copy=False)
+    out = np.empty_like(a)
+    unwrap_deg_inplace(a, out)
+    return out
 
 
-def angle_diff_deg(a, b):
-    """Minimal signed difference (a - b) in degrees, in [-180, 180]."""
-    return wrap180(np.asarray(a, float) - np.asarray(b, float))
+@njit(EMA_SIGS, cache=True, fastmath=True)
+def _ema_core(x, alpha, y):
+    for i in range(1, len(x)):
+        y[i] = alpha * x[i] + (1.0 - alpha) * y[i - 1]
 
 
 def ema_1d(x, alpha):
     """Simple 1D exponential moving average."""
-    x = np.asarray(x, float)
+    x = as_float(x)
     if len(x) == 0:
         return x
     y = np.empty_like(x)
     y[0] = x[0]
-    for i in range(1, len(x)):
-        y[i] = alpha * x[i] + (1.0 - alpha) * y[i - 1]
+    _ema_core(x, alpha, y)
     return y
 
 
+@njit(EMA_MULTI_SIGS, cache=True)
+def ema_multi(X, alphas, Y):
+    """EMA of each row of `X` (one alpha per row) into `Y`."""
+    n = X.shape[1]
+    if n == 0:
+        return
+    for k in range(X.shape[0]):
+        a = alphas[k]
+        Y[k, 0] = X[k, 0]
+        for i in range(1, n):
+            Y[k, i] = a * X[k, i] + (1.0 - a) * Y[k, i - 1]
+
+
+def ffill_nan(x):
+    """Forward-fill NaNs; leading NaNs take the first finite value."""
+    x = as_float(x)
+    finite = np.isfinite(x)
+    if not finite.any():
+        return x.copy()
+    first = np.argmax(finite)
+    idx = np.where(finite, np.arange(len(x)), first)
+    np.maximum.accumulate(idx, out=idx)
+    return x[idx]
+
+
+# The jitted helpers are compiled eagerly for float32/float64 only (the
+# wrappers above normalise dtypes via as_float) and cached on disk. Run each
+# once at import so the cache is populated before the first upload.
+for _dtype in (np.float32, np.float64):
+    ema_1d(np.zeros(2, _dtype), 0.5)
+    unwrap_deg(np.zeros(2, _dtype))
+    ema_multi(np.zeros((1, 2), _dtype), np.ones(1, _dtype), np.empty((1, 2), _dtype))
+
+
 # ------------------------------------------------------------
 # Time-alignment helper (for GPS heading lag)
 # ------------------------------------------------------------
@@ -80,33 +202,31 @@ def shift_back_in_time(sig, t, lag_s):
     if len(sig) == 0:
         return sig
 
+    # Uniformly sampled logs: the lag is a constant (fractional) index offset,
+    # so blend the two neighbouring samples instead of searching per sample
+    if len(t) > 1:
+        dts = np.diff(t)
+        dt_med = np.median(dts)
+        if dt_med > 0 and np.ptp(dts) < 0.1 * dt_med:
+            k = lag_s / dt_med
+            ki = int(np.floor(k))
+            f = k - ki
+            j = np.arange(len(sig)) + ki
+            j0 = np.clip(j, 0, len(sig) - 1)
+            j1 = np.clip(j + 1, 0, len(sig) - 1)
+            return (1.0 - f) * sig[j0] + f * sig[j1]
+
     t_src = t + lag_s
     shifted = np.interp(t_src, t, sig, left=sig[0], right=sig[-1])
     return shifted
 
 
-# ------------------------------------------------------------
-# Geo helpers
-# ------------------------------------------------------------
-def haversine_m(lat1, lon1, lat2, lon2):
-    R = 6371000.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlmb = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
-    return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
-# ------------------------------------------------------------
-# CSV loader for ESP32 log format (16 columns)
-# ------------------------------------------------------------
 # ------------------------------------------------------------
 # CSV loader for ESP32 log format (14, 16, or 17 columns)
 # ------------------------------------------------------------
 def load_csv_arduino(file_like):
     """
-    Load ESP32 log CSV with NO header.
+    Load ESP32 log CSV with NO header from a binary file-like object.
 
     Supported formats:
 
@@ -127,7 +247,20 @@ def load_csv_arduino(file_like):
       lat, lon, spd_mph, yaw_mode,
       tach_pulses, tach_min_dt_us, throttle_pct
     """
-    df = pd.read_csv(file_like, header=None)
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            file_like,
+            read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+            # Skip rows with a missing/extra field (e.g. last line cut off by
+            # power loss) instead of rejecting the whole log
+            parse_options=pacsv.ParseOptions(invalid_row_handler=lambda row: "skip"),
+            convert_options=pacsv.ConvertOptions(
+                column_types={f"f{i}": pa.float64() for i in range(17)},
+            ),
+        )
+        df = table.to_pandas()
+    else:
+        df = pd.read_csv(file_like, header=None, on_bad_lines="skip")
     n_cols = df.shape[1]
 
     if n_cols == 14:
@@ -205,13 +338,25 @@ def load_csv_arduino(file_like):
             "Make sure CSV matches one of the supported ESP32 logging formats."
         )
 
+    # pandas pads a short row (e.g. last line cut off by power loss) with NaN
+    # where pyarrow skips it; drop rows that never got a yaw_mode either way
+    df = df[df["yaw_mode"].notna()].reset_index(drop=True)
+
+    # Settle dtypes once so downstream code can use .values directly
+    # Signals carry only a few significant digits, so float32 halves the memory
+    # traffic in the filters; time and GPS position need float64
+    wide_cols = ("timestamp_ms", "lat", "lon")
+    df = df.astype(
+        {c: (np.float64 if c in wide_cols else np.float32)
+         for c in df.columns if c != "yaw_mode"}
+    )
+    df["yaw_mode"] = df["yaw_mode"].astype(int)
+
     # Common time column
-    df["timestamp_ms"] = df["timestamp_ms"].astype(float)
     df["time_s"] = df["timestamp_ms"] / 1000.0
     return df
 
 
-
 # ------------------------------------------------------------
 # Yaw alignment helper (works on UNWRAPPED angles)
 # ------------------------------------------------------------
@@ -235,86 +380,95 @@ def align_yaw_to_heading(yaw_unwrapped, heading_unwrapped, speed):
     if not mask.any():
         return yaw_unwrapped, 1.0, 0.0
 
-    best_err = None
-    best_sign = 1.0
-    best_offset_deg = 0.0
-    best_yaw_aligned_unwrapped = None
-
-    for sign in (+1.0, -1.0):
-        yaw_signed = sign * yaw_unwrapped
+    # Evaluate both signs at once: row 0 is +yaw, row 1 is -yaw
+    yaw_m = yaw_unwrapped[mask]
+    heading_m = heading_unwrapped[mask]
+    diff = wrap180(np.stack([yaw_m - heading_m, -yaw_m - heading_m]))
 
-        diff = wrap180(yaw_signed[mask] - heading_unwrapped[mask])
+    if ne is not None:
+        k = math.pi / 180.0
+        sin_d = ne.evaluate("sin(diff * k)")
+        cos_d = ne.evaluate("cos(diff * k)")
+    else:
         diff_rad = np.radians(diff)
-        mean_s = np.mean(np.sin(diff_rad))
-        mean_c = np.mean(np.cos(diff_rad))
-        offset_rad = math.atan2(mean_s, mean_c)
-        offset_deg = math.degrees(offset_rad)
-
-        yaw_aligned_unwrapped = yaw_signed - offset_deg
-
-        residual = angle_diff_deg(
-            yaw_aligned_unwrapped[mask],
-            heading_unwrapped[mask],
-        )
-        err = np.nanstd(residual)
+        sin_d = np.sin(diff_rad)
+        cos_d = np.cos(diff_rad)
 
-        if (best_err is None) or (err < best_err):
-            best_err = err
-            best_sign = sign
-            best_offset_deg = offset_deg
-            best_yaw_aligned_unwrapped = yaw_aligned_unwrapped
+    offsets_deg = np.degrees(np.arctan2(sin_d.mean(axis=1), cos_d.mean(axis=1)))
+    errs = np.nanstd(wrap180(diff - offsets_deg[:, None]), axis=1)
 
-    if best_yaw_aligned_unwrapped is None:
-        best_yaw_aligned_unwrapped = yaw_unwrapped
+    # Prefer +1 unless -1 is strictly better (NaN errors keep +1)
+    best = 1 if errs[1] < errs[0] else 0
+    best_sign = 1.0 if best == 0 else -1.0
+    best_offset_deg = float(offsets_deg[best])
+    best_yaw_aligned_unwrapped = best_sign * yaw_unwrapped - best_offset_deg
 
     return best_yaw_aligned_unwrapped, best_sign, best_offset_deg
 
 # ------------------------------------------------------------
 # Lap detection
 # ------------------------------------------------------------
+LAP_DTYPE = np.dtype([
+    ("lap", "i4"),
+    ("start_idx", "i4"),
+    ("end_idx", "i4"),
+    ("start_time", "f8"),
+    ("end_time", "f8"),
+    ("lap_time_s", "f8"),
+])
+
+
+def encode_laps(laps):
+    """Pack a LAP_DTYPE array into a JSON-safe dict for dcc.Store."""
+    return {
+        "b64": base64.b64encode(laps.tobytes()).decode("ascii"),
+        "dtype": laps.dtype.descr,
+    }
+
+
+def decode_laps(blob):
+    """Inverse of encode_laps (read-only array)."""
+    dtype = np.dtype([tuple(field) for field in blob["dtype"]])
+    return np.frombuffer(base64.b64decode(blob["b64"]), dtype=dtype)
+
+
 def detect_laps(df):
+    """Return one LAP_DTYPE record per lap between start-gate crossings."""
     lat = df["lat"].values
     lon = df["lon"].values
     t = df["time_s"].values
 
-    dists = [haversine_m(lat[i], lon[i], START_LAT, START_LON)
-             for i in range(len(df))]
-
-    crossings = []
-    inside_prev = dists[0] <= RADIUS_M
-
-    for i in range(1, len(df)):
-        inside = dists[i] <= RADIUS_M
-        if inside and not inside_prev:
-            dA = dists[i - 1]
-            dB = dists[i]
-            tA = t[i - 1]
-            tB = t[i]
-
-            if dA == dB:
-                t_cross = tB
-            else:
-                ratio = (dA - RADIUS_M) / (dA - dB)
-                ratio = max(0.0, min(1.0, ratio))
-                t_cross = tA + ratio * (tB - tA)
-
-            crossings.append((i, t_cross))
-        inside_prev = inside
-
-    laps = []
-    for j in range(1, len(crossings)):
-        idxA, tA = crossings[j - 1]
-        idxB, tB = crossings[j]
-        lap_t = tB - tA
-        if lap_t >= MIN_LAP_TIME_S:
-            laps.append({
-                "lap": len(laps) + 1,
-                "start_idx": idxA,
-                "end_idx": idxB,
-                "start_time": tA,
-                "end_time": tB,
-                "lap_time_s": lap_t,
-            })
+    # Vectorized haversine distance from every sample to the start gate
+    phi1 = np.radians(lat)
+    dphi = phi1 - _PHI0
+    dlmb = np.radians(lon) - _LMB0
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * _COS_PHI0 * np.sin(dlmb / 2) ** 2
+    dists = 2 * 6371000.0 * np.arcsin(np.sqrt(a))
+
+    # Rising edges: previous sample outside the gate, current one inside
+    inside = dists <= RADIUS_M
+    idx = np.flatnonzero(inside[1:] & ~inside[:-1]) + 1
+
+    # Linear interpolation of the crossing time between the two samples
+    dA = dists[idx - 1]
+    dB = dists[idx]
+    tA = t[idx - 1]
+    tB = t[idx]
+    same = dA == dB
+    denom = np.where(same, 1.0, dA - dB)
+    ratio = np.clip((dA - RADIUS_M) / denom, 0.0, 1.0)
+    t_cross = np.where(same, tB, tA + ratio * (tB - tA))
+
+    # Consecutive crossings bound a lap; drop the ones that are too short
+    lap_times = np.diff(t_cross)
+    keep = np.flatnonzero(lap_times >= MIN_LAP_TIME_S)
+    laps = np.empty(len(keep), dtype=LAP_DTYPE)
+    laps["lap"] = np.arange(1, len(keep) + 1)
+    laps["start_idx"] = idx[keep]
+    laps["end_idx"] = idx[keep + 1]
+    laps["start_time"] = t_cross[keep]
+    laps["end_time"] = t_cross[keep + 1]
+    laps["lap_time_s"] = lap_times[keep]
     return laps
 
 
@@ -324,6 +478,41 @@ def detect_laps(df):
 app = Dash(__name__)
 server = app.server
 
+
+class LRUCache:
+    """Minimal in-process stand-in for flask_caching.Cache (get/set only)."""
+
+    def __init__(self, maxsize):
+        self._items = OrderedDict()
+        self._maxsize = maxsize
+        # Callbacks run concurrently on the threaded dev server
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+
+# Processed DataFrames live server-side; dcc.Store only carries a key to them
+if Cache is not None:
+    cache = Cache(server, config={
+        "CACHE_TYPE": "SimpleCache",
+        "CACHE_DEFAULT_TIMEOUT": 0,
+        "CACHE_THRESHOLD": DF_CACHE_SIZE,
+    })
+else:
+    cache = LRUCache(DF_CACHE_SIZE)
+
 app.layout = html.Div(
     style={"backgroundColor": "#050608", "color": "#ECECEC", "minHeight": "100vh", "padding": "20px"},
     children=[
@@ -388,36 +577,67 @@ def parse_contents(contents, filename):
     - compute smoothed, gated slip angle
     - compute RPM from tach pulses
     """
-    content_type, content_string = contents.split(",")
-    decoded = base64.b64decode(content_string)
-    df = load_csv_arduino(io.StringIO(decoded.decode("utf-8")))
+    content_string = contents.split(",", 1)[1]
+    # a2b_base64 reads the ASCII str in place (b64decode would first copy it to
+    # bytes); the CSV reader then consumes the raw bytes without a utf-8 decode
+    df = load_csv_arduino(io.BytesIO(binascii.a2b_base64(content_string)))
 
     t = df["time_s"].values
-    speed = df["speed_mph"].astype(float).values
-    yaw_mode = df["yaw_mode"].astype(int).values
+    speed = df["speed_mph"].values
+    yaw_mode = df["yaw_mode"].values
 
     # -------- GPS heading from yaw_gps_deg --------
-    yaw_gps_raw = df["yaw_gps_deg"].astype(float).values
+    yaw_gps_raw = df["yaw_gps_deg"].values
 
     heading = np.full_like(yaw_gps_raw, np.nan, dtype=float)
     mask_good = speed >= HEADING_SPEED_THRESH_MPH
     heading[mask_good] = yaw_gps_raw[mask_good]
 
     # forward-fill from first valid
-    valid_idx = np.where(np.isfinite(heading))[0]
-    if len(valid_idx) > 0:
-        first = valid_idx[0]
-        heading[:first] = heading[first]
-        for i in range(first + 1, len(heading)):
-            if not np.isfinite(heading[i]):
-                heading[i] = heading[i - 1]
+    heading = ffill_nan(heading)
 
     # Time-shift GPS heading backwards to compensate for lag
     heading = shift_back_in_time(heading, t, GPS_HEADING_LAG_S)
 
-    # Unwrap & smooth heading
-    heading_unwrapped = unwrap_deg(heading)
-    heading_unwrapped = ema_1d(heading_unwrapped, HEADING_SMOOTH_ALPHA)
+    # Unwrap heading (smoothed below together with the other channels)
+    heading_unwrapped_raw = unwrap_deg(heading)
+
+    # -------- Accel --------
+    ax = df["accel_x_g"].values
+    ay = df["accel_y_g"].values
+    az = df["accel_z_g"].values
+
+    # -------- RPM from tach pulses --------
+    tach = df["tach_pulses"].values
+    # first sample: copy second dt
+    t_prev0 = t[0] - (t[1] - t[0]) if len(t) > 1 else np.nan
+    dt = np.diff(t, prepend=t_prev0)
+    dt[dt == 0.0] = np.nan
+
+    pps = tach / dt  # pulses per second
+    rpm_raw = pps * 60.0 / PULSES_PER_REV
+    rpm_raw[tach <= 0] = np.nan
+    rpm_valid = np.isfinite(rpm_raw)
+
+    # -------- Smooth the independent channels in one batched pass --------
+    # Yaw and slip depend on the smoothed heading, so they are filtered later
+    X = np.empty((5, len(t)), dtype=np.float32)
+    X[0] = heading_unwrapped_raw
+    X[1] = ax
+    X[2] = ay
+    X[3] = az
+    X[4] = ffill_nan(rpm_raw)
+    alphas = np.array([
+        HEADING_SMOOTH_ALPHA,
+        IMU_ACCEL_SMOOTH_ALPHA,
+        IMU_ACCEL_SMOOTH_ALPHA,
+        IMU_ACCEL_SMOOTH_ALPHA,
+        RPM_SMOOTH_ALPHA,
+    ], dtype=X.dtype)
+    Y = np.empty_like(X)
+    ema_multi(X, alphas, Y)
+    heading_unwrapped, ax_f, ay_f, az_f, rpm_smooth = Y
+
     heading_deg = wrap180(heading_unwrapped)
 
     df["heading_raw"] = heading
@@ -425,7 +645,7 @@ def parse_contents(contents, filename):
     df["heading_deg"] = heading_deg
 
     # -------- Body yaw from IMU fusion on-board --------
-    yaw_body = df["yaw_deg"].astype(float).values
+    yaw_body = df["yaw_deg"].values
     yaw_unwrapped = unwrap_deg(yaw_body)
 
     yaw_aligned_unwrapped_raw, yaw_sign, yaw_offset_deg = align_yaw_to_heading(
@@ -443,19 +663,14 @@ def parse_contents(contents, filename):
     df["yaw_aligned_deg"] = wrap180(yaw_aligned_unwrapped)
 
     # -------- Accel smoothing and magnitude --------
-    ax = df["accel_x_g"].astype(float).values
-    ay = df["accel_y_g"].astype(float).values
-    az = df["accel_z_g"].astype(float).values
-
-    ax_f = ema_1d(ax, IMU_ACCEL_SMOOTH_ALPHA)
-    ay_f = ema_1d(ay, IMU_ACCEL_SMOOTH_ALPHA)
-    az_f = ema_1d(az, IMU_ACCEL_SMOOTH_ALPHA)
-
     df["accel_x_g_filt"] = ax_f
     df["accel_y_g_filt"] = ay_f
     df["accel_z_g_filt"] = az_f
 
-    acc_mag = np.sqrt(ax_f * ax_f + ay_f * ay_f + az_f * az_f)
+    if ne is not None:
+        acc_mag = ne.evaluate("sqrt(ax_f * ax_f + ay_f * ay_f + az_f * az_f)")
+    else:
+        acc_mag = np.sqrt(ax_f * ax_f + ay_f * ay_f + az_f * az_f)
     df["accel_mag_g"] = acc_mag
 
     # -------- Slip angle: yaw_aligned - heading --------
@@ -469,14 +684,8 @@ def parse_contents(contents, filename):
     # Smooth slip where valid
     finite = np.isfinite(slip_deg)
     if finite.any():
-        slip_ff = slip_deg.copy()
         # forward-fill for smoothing
-        last = slip_ff[finite][0]
-        for i in range(len(slip_ff)):
-            if np.isfinite(slip_ff[i]):
-                last = slip_ff[i]
-            else:
-                slip_ff[i] = last
+        slip_ff = ffill_nan(slip_deg)
         slip_smooth = ema_1d(slip_ff, SLIP_SMOOTH_ALPHA)
         slip_smooth[~finite] = np.nan
     else:
@@ -484,37 +693,33 @@ def parse_contents(contents, filename):
 
     df["slip_deg"] = slip_smooth
 
-    # -------- RPM from tach pulses --------
-    df["tach_pulses"] = df["tach_pulses"].astype(float)
-    df["dt_s"] = df["time_s"].diff()
-    if len(df) > 1:
-        # first sample: copy second dt
-        if pd.isna(df["dt_s"].iloc[0]):
-            df.loc[df.index[0], "dt_s"] = df["dt_s"].iloc[1]
-    df["dt_s"].replace(0.0, np.nan, inplace=True)
-
-    df["pps"] = df["tach_pulses"] / df["dt_s"]  # pulses per second
-    df["rpm_raw"] = df["pps"] * 60.0 / PULSES_PER_REV
-    df.loc[df["tach_pulses"] <= 0, "rpm_raw"] = np.nan
-
-    # Smooth rpm
-    rpm_ff = df["rpm_raw"].copy()
-    if rpm_ff.notna().any():
-        first_valid = rpm_ff.first_valid_index()
-        rpm_ff.iloc[:first_valid] = rpm_ff.loc[first_valid]
-        rpm_smooth = ema_1d(rpm_ff.values, RPM_SMOOTH_ALPHA)
-        rpm_smooth = pd.Series(rpm_smooth, index=df.index)
-        rpm_smooth[df["rpm_raw"].isna()] = np.nan
-        df["rpm_smooth"] = rpm_smooth
-    else:
-        df["rpm_smooth"] = df["rpm_raw"]
+    # -------- RPM --------
+    rpm_smooth[~rpm_valid] = np.nan
+
+    df["tach_pulses"] = tach
+    df["dt_s"] = dt
+    df["pps"] = pps
+    df["rpm_raw"] = rpm_raw
+    df["rpm_smooth"] = rpm_smooth
 
     # Lap detection
     laps = detect_laps(df)
 
+    # Relative time for the full run and within each lap, so plotting a lap
+    # is just a row slice
+    t_rel = t - t[0] if len(t) else t.copy()
+    t_lap = t_rel.copy()
+    for start, end in zip(laps["start_idx"].tolist(), laps["end_idx"].tolist()):
+        t_lap[start:end] = t[start:end] - t[start]
+    df["t_rel"] = t_rel
+    df["t_lap"] = t_lap
+
+    uid = uuid.uuid4().hex
+    cache.set(uid, df)
+
     payload = {
-        "df_json": df.to_json(date_format="iso", orient="split"),
-        "laps": laps,
+        "uid": uid,
+        "laps": encode_laps(laps),
         "filename": filename,
         "yaw_sign": float(yaw_sign),
         "yaw_offset_deg": float(yaw_offset_deg),
@@ -542,7 +747,7 @@ def handle_upload(contents, filename):
     except Exception as e:
         return None, f"Error: {e}", [], None
 
-    laps = result["laps"]
+    laps = decode_laps(result["laps"])
     lap_options = [{"label": "Full Run", "value": "full"}] + [
         {"label": f"Lap {lap['lap']} ({lap['lap_time_s']:.1f}s)", "value": f"lap_{lap['lap']}"}
         for lap in laps
@@ -567,26 +772,41 @@ def update_graph(data, lap_value, plot_type):
     if data is None:
         raise PreventUpdate
 
-    df = pd.read_json(data["df_json"], orient="split")
-    laps = data["laps"]
+    df = cache.get(data["uid"])
+    if df is None:
+        # Evicted, or the server restarted since the upload
+        fig = go.Figure()
+        fig.update_layout(
+            title="Telemetry data is no longer loaded - please re-upload the CSV",
+            template="plotly_dark",
+        )
+        return fig
+    laps = decode_laps(data["laps"])
 
-    if lap_value == "full" or not laps:
-        view = df.copy()
-    else:
+    lap = None
+    if lap_value != "full" and len(laps):
         lap_idx = int(lap_value.split("_")[1])
-        lap = next((l for l in laps if l["lap"] == lap_idx), None)
-        if lap is None:
-            view = df.copy()
-        else:
-            view = df[(df["time_s"] >= lap["start_time"]) & (df["time_s"] <= lap["end_time"])]
+        hit = np.flatnonzero(laps["lap"] == lap_idx)
+        if len(hit):
+            lap = laps[hit[0]]
+
+    if lap is None:
+        view = df
+        t_rel = df["t_rel"]
+    else:
+        view = df.iloc[int(lap["start_idx"]):int(lap["end_idx"])]
+        t_rel = view["t_lap"]
 
-    view = view.copy()
-    view["t_rel"] = view["time_s"] - view["time_s"].iloc[0]
+    # Thin out long views; WebGL copes fine but this cuts bytes sent to the browser
+    if len(view) > PLOT_DOWNSAMPLE_ABOVE:
+        step = max(1, len(view) // PLOT_MAX_POINTS)
+        view = view.iloc[::step]
+        t_rel = t_rel.iloc[::step]
 
     fig = go.Figure()
 
     if plot_type == "GPS Track":
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=view["lon"],
             y=view["lat"],
             mode="lines",
@@ -600,14 +820,14 @@ def update_graph(data, lap_value, plot_type):
         )
 
     elif plot_type == "Yaw vs Heading":
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["yaw_aligned_unwrapped"],
             mode="lines",
             name="Yaw (IMU fused, aligned) [deg]",
         ))
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["heading_unwrapped"],
             mode="lines",
             name="GPS heading (unwrapped) [deg]",
@@ -619,8 +839,8 @@ def update_graph(data, lap_value, plot_type):
         )
 
     elif plot_type == "Slip vs Time":
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["slip_deg"],
             mode="lines",
             name=f"Slip [deg] (>= {SLIP_SPEED_THRESH_MPH} mph, GPS-corrected)",
@@ -632,8 +852,8 @@ def update_graph(data, lap_value, plot_type):
         )
 
     elif plot_type == "Speed vs Time":
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["speed_mph"],
             mode="lines",
             name="Speed [mph]",
@@ -645,26 +865,26 @@ def update_graph(data, lap_value, plot_type):
         )
 
     elif plot_type == "Accel vs Time":
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["accel_x_g_filt"],
             mode="lines",
             name="Accel X [g]",
         ))
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["accel_y_g_filt"],
             mode="lines",
             name="Accel Y [g]",
         ))
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["accel_z_g_filt"],
             mode="lines",
             name="Accel Z [g]",
         ))
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["accel_mag_g"],
             mode="lines",
             name="|Accel| [g]",
@@ -676,14 +896,14 @@ def update_graph(data, lap_value, plot_type):
         )
 
     elif plot_type == "RPM vs Time":
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["rpm_smooth"],
             mode="lines",
             name="RPM (smoothed)",
         ))
-        fig.add_trace(go.Scatter(
-            x=view["t_rel"],
+        fig.add_trace(go.Scattergl(
+            x=t_rel,
             y=view["rpm_raw"],
             mode="lines",
             name="RPM (raw)",